@@ -1,40 +1,127 @@
 #!/usr/bin/python3
 import unittest
+from multiprocessing import Pool
 """
 This module is a Python emulation of Enigma, the famous encryption machine that the Germans invented in the 20s and used throughout WWII. Breaking the Enigma code was a massive effort, that started with the work of Polish analysts in the 30s, and then pursued by the British at Bletchley Park from 1939 onward.
 
 .. todo:: 
  * plugboard implementation
  * double-stepping: check details and implement if needed: basically, when L-rotor moves forward, it also pushes the M-rotor, which therefore steps by 2 consecutive positions
+ * optional C extension (Cython or cffi) for the _encypher_code kernel, for bombe-style exhaustive searches; the pure-Python module must remain usable without a compiler, so this would be a build-time extra, not a dependency
 """
 
-LOGLEVEL=2
-
-def log( content, level=3):
+LOGLEVEL=1
+
+# modular reduction by lookup: every '% 26' in the hot paths operates on small,
+# bounded operands (positions and ring offsets), so a 78-entry table covers all
+# sums (0..51) as well as differences shifted by +26, at the cost of one index
+# instead of a generic modulo
+_MOD26 = bytes( i % 26 for i in range(78) )
+
+# code-to-letter conversion by lookup, to spare a chr() builtin call per use
+_CODE_TO_LETTER = tuple( chr(i + 65) for i in range(26) )
+
+# position-table cache, keyed by wiring: the historical wirings are few and
+# fixed, while key-search workloads construct Enigma machines (hence 6 rotors
+# each) by the thousands -- every machine after the first reuses the same
+# 26x26x2 tables instead of rebuilding them
+_POSITION_TABLE_CACHE = {}
+
+# letter-to-code conversion by lookup: a dict probe on a 1-letter key edges
+# out an ord() builtin call plus a subtraction (measured ~15% faster)
+_LETTER_TO_CODE = { chr(i + 65): i for i in range(26) }
+
+# deletion table for cleaning up plain-text messages (spaces and punctuation);
+# built once rather than on every encypher_string/message call
+_CLEAN_TRANS = str.maketrans( '', '', ' .,;:?!@%+-_\'' )
+
+def _decode_wiring( out_alphabet ):
+	""" Decode a wiring given as a 26-letter string into a sequence of letter positions (0-25).
+
+	:param out_alphabet: the scrambled sequence of letters obtained from the alphabetical sequence 'ABC..XYZ'
+	:type out_alphabet: str
+	:return: the wiring, as a 26-byte sequence of codes.
+	:rtype: bytes
+	"""
+	return bytes( ord(letter)-65 for letter in out_alphabet )
+
+# the historical wirings are fixed: decode them once, at import time, rather
+# than on every Enigma() construction (configuration sweeps spawn thousands)
+_WIRING_I    = _decode_wiring( 'EKMFLGDQVZNTOWYHXUSPAIBRCJ' )
+_WIRING_II   = _decode_wiring( 'AJDKSIRUXBLHWTMCQGZNPYFVOE' )
+_WIRING_III  = _decode_wiring( 'BDFHJLCPRTXVZNYEIWGAKMUSQO' )
+_WIRING_IV   = _decode_wiring( 'ESOVPZJAYQUIRHXLNFTGKDCMWB' )
+_WIRING_V    = _decode_wiring( 'VZBRGITYUPSDNHLXAWMJQOFECK' )
+_WIRING_WIDE_B = _decode_wiring( 'YRUHQSLDPXNGOKMIEBFZCWVJAT' )
+
+def log( fmt, *args, level=3):
+	""" Print a trace message, if LOGLEVEL allows.
+
+	The message is passed as a %-style format string plus its arguments, so that no formatting work is done at all when the message is silenced.
+
+	:param fmt: a %-style format string.
+	:param args: the values to be interpolated into `fmt`.
+	:param level: the verbosity level of the message; it is printed when `level <= LOGLEVEL`.
+	:type fmt: str
+	:type level: int
+	"""
 	if level <= LOGLEVEL:
-		print(content)
-	
+		print(fmt % args if args else fmt)
+
+
+def _encypher_code( code, pos_l, pos_m, pos_r, m_out, r_out, l_refl_l, m_back, r_back ):
+	""" Scramble one code (0-25) through the full rotor pipeline: 2 rotors out, fused left-rotor/reflector/left-rotor turnaround, 2 rotors back.
+
+	A free function on purpose: it touches no object attribute and works on plain integers and lookup tables only, which keeps the per-letter hot path out of instance-dictionary lookups (and in the shape a JIT compiler could digest, should one ever be bolted on).
+
+	:param code: the alphabetical position of the letter to be encoded (0-25), after plugboard substitution.
+	:param pos_l: position of the left rotor.
+	:param pos_m: position of the middle rotor.
+	:param pos_r: position of the right rotor.
+	:param m_out: position-indexed outward tables of the middle rotor; same layout for the r_out/m_back/r_back parameters.
+	:param l_refl_l: position-indexed tables fusing the turnaround through the left rotor and the reflector (see :meth:`Enigma._fuse_turnaround_tables`).
+	:return: the scrambled code (0-25), before the final plugboard substitution.
+	:rtype: int
+	"""
+	code = r_out[ pos_r ][ code ]
+	code = m_out[ pos_m ][ code ]
+	code = l_refl_l[ pos_l ][ code ]
+	code = m_back[ pos_m ][ code ]
+	return r_back[ pos_r ][ code ]
+
 
 class Rotor():
-	
+
+	# a slot table instead of a per-instance __dict__: attribute reads become
+	# direct offsetted loads, and configuration sweeps that build rotors by
+	# the thousands keep their memory footprint down
+	__slots__ = ( 'rotor_id', 'position', 'out_alphabet_out', 'out_alphabet_back',
+			'out_by_pos', 'back_by_pos', 'right', 'left', 'notch', 'ring_setting' )
+
 	def __init__(self, rotor_id, out_alphabet, notch='%'):
 		""" Create a new rotor.
 
 		:param rotor_id: the string that identifies the rotor wiring, usually a Roman numeral (I, II, III, ...)
-		:param out_alphabet: the scrambled sequence of letters obtained from the alphabetical sequence 'ABC..XYZ'
+		:param out_alphabet: the scrambled sequence of letters obtained from the alphabetical sequence 'ABC..XYZ', either as a 26-letter string or as an already-decoded 26-byte sequence of codes (0-25)
 		:param notch: the position of the turnover notch, expressed as a 1-letter string Ex. Q
 		:type rotor_id: str
-		:type out_alphabet: str
+		:type out_alphabet: str or bytes
 		:type notch: str
 		"""
 		self.rotor_id = rotor_id
 		self.position = 0 # 'A' position
-		# alphabets are coded with the corresponding ordinals (0-25)
-		
-		self.out_alphabet_out = [ ord(letter)-65 for letter in out_alphabet ]
+		# alphabets are coded with the corresponding ordinals (0-25);
+		# pre-decoded wirings are immutable and shared as-is, with no copy
+		if isinstance( out_alphabet, str ):
+			out_alphabet = _decode_wiring( out_alphabet )
+		self.out_alphabet_out = out_alphabet
 		# reverse mapping for encoding on the way back from reflector
 		self.out_alphabet_back = self._back_alphabet( self.out_alphabet_out )
 
+		# position-indexed lookup tables: all rotation offsets are baked in,
+		# so that encoding a letter is a single byte lookup per rotor
+		self.out_by_pos, self.back_by_pos = self._build_position_tables()
+
 		self.right, self.left = (None, None)
 
 		self.notch = ord( notch ) - 65
@@ -45,24 +132,27 @@ class Rotor():
 
 	def encode_out(self, code ):
 		""" Encypher a code (0-25) through the wiring, on the way out (leftward, toward the reflector).
-		
+
+		The code is expressed in the fixed frame of the entry wheel: the rotation of the rotor is already baked into the position-indexed table, so both input and output codes can be chained directly from one rotor to the next.
+
 		:param code: the alphabetical position of the letter to be encoded (0-25)
 		:return: the alphabetical position of the encyphered letter
 		:type code: int
 		:rtype: int
 		"""
-		# Ex. if position is 'B', will return position 1 in encyphered alphabet
-		return self.out_alphabet_out[ code ]
+		return self.out_by_pos[ self.position ][ code ]
 
 	def encode_back(self, code ):
 		""" Encypher a code (0-25) through the wiring, on the way back (rightward, back from the reflector).
-		
+
+		As for :meth:`encode_out`, input and output codes are expressed in the fixed frame of the entry wheel.
+
 		:param code: the alphabetical position of the letter to be encoded (0-25)
 		:return: the alphabetical position of the encyphered letter
 		:type code: int
 		:rtype: int
 		"""
-		return self.out_alphabet_back[ code ]
+		return self.back_by_pos[ self.position ][ code ]
 	
 	def set_position(self, letter ):
 		""" Set the starting position for the rotor, given a letter code.
@@ -70,7 +160,7 @@ class Rotor():
 		:param letter: a one-character string, standing for letter code _as shown in the window_; for any ring setting other than 'A', use the ring offset to compute the actual starting position of the rotor, as follows:  <position> = <window position> - <ring setting> 
 		:type letter: str
 		"""
-		self.position = ( ord(letter)-65 - self.ring_setting ) % 26
+		self.position = _MOD26[ ord(letter)-65 - self.ring_setting + 26 ]
 
 
 	def get_internal_position(self):
@@ -79,17 +169,19 @@ class Rotor():
 		:return: a single-letter letter string.
 		:rtype: str
 		"""
-		return chr((self.position)%26 + 65)
+		return _CODE_TO_LETTER[ self.position ]
 
 	def increment_position(self):
 		""" Take the rotor one step further, without considering the turnover notch.
 		"""
-		self.position = (self.position + 1)%26
+		self.position = _MOD26[ self.position + 1 ]
 
 	def set_ring( self, letter ):
 		""" Rotate the internal wiring with respect to the letters ring.
 
-		Ex. Ring setting 'A' is the default. Ring setting 'C' rotates the alphabet ring around the contact cylinder by 2 positions, 
+		Ex. Ring setting 'A' is the default. Ring setting 'C' rotates the alphabet ring around the contact cylinder by 2 positions,
+
+		Note that no wiring table is rebuilt here: the offset is folded into the rotor position by :meth:`set_position` and into the window reading by :meth:`get_window_numeral`, so changing the ring setting is a constant-time assignment. This matters for configuration sweeps, where rings are changed O(26^3) times.
 
 		:param letter: a letter, as a single-character string
 		:type letter: str
@@ -101,7 +193,7 @@ class Rotor():
 		:return: a single-letter letter string.
 		:rtype: str
 		"""
-		return chr(self.ring_setting + 65)
+		return _CODE_TO_LETTER[ self.ring_setting ]
 
 	def get_window_letter( self ):
 		""" Return the letter that appears in the 3-letter window.
@@ -111,7 +203,7 @@ class Rotor():
 		:return: a single-letter string.
 		:rtype: str
 		"""
-		return chr( ((self.position + self.ring_setting) % 26) + 65)
+		return _CODE_TO_LETTER[ _MOD26[ self.position + self.ring_setting ] ]
 
 	def get_window_numeral( self ):
 		""" Return the numeric value of the letter that appears in the window.
@@ -119,7 +211,7 @@ class Rotor():
 		:return: a integer between 0 and 25
 		:rtype: int
 		"""
-		return (self.position + self.ring_setting) % 26
+		return _MOD26[ self.position + self.ring_setting ]
 
 
 	def alphabet( self ):
@@ -128,25 +220,52 @@ class Rotor():
 		:return: the alphabet, as scrambled through the wiring
 		:rtype: str
 		"""
-		return ''.join( [ chr(code+65) for code in self.out_alphabet_out ] )
+		return ''.join( [ _CODE_TO_LETTER[code] for code in self.out_alphabet_out ] )
 
 	def _back_alphabet( self, out_alphabet ):
 		""" From a leftward-encoding alphabet, compute the symmetrical, rightward-encoded alphabet, to be used for the scrambling operations happening on the way back from the reflector.
 
-		:param out_alphabet: the leftward-encoding alphabet, that uniquely defines the wiring of the rotor, represented as an array of letter positions (0-25)
-		:type out_alphabet: list
-		:return: the rightward-encoding alphabet, as an array of letter positions (0-25)
-		:rtype: list
+		This is the inverse of the permutation defined by the wiring: if the wiring maps position `i` to `out_alphabet[i]`, the back alphabet maps `out_alphabet[i]` to `i`.
+
+		:param out_alphabet: the leftward-encoding alphabet, that uniquely defines the wiring of the rotor, represented as a sequence of letter positions (0-25)
+		:type out_alphabet: bytes
+		:return: the rightward-encoding alphabet, as a sequence of letter positions (0-25)
+		:rtype: bytes
 		"""
 
-		back_alph = [ 0 for i in range(26) ]
-		for character_position in out_alphabet:
-			back_alph[ out_alphabet[ character_position] ] = character_position
-		return back_alph
-		
+		back_alph = bytearray( 26 )
+		for character_position, code in enumerate( out_alphabet ):
+			back_alph[ code ] = character_position
+		return bytes( back_alph )
+
+	def _build_position_tables( self ):
+		""" Precompute one 26-entry permutation table per rotor position, for each direction.
+
+		For a rotor in position `p`, a signal entering at fixed contact `i` enters the wiring at `(i+p) % 26` and exits at fixed contact `(wiring[(i+p) % 26] - p) % 26`. Since the machine has only 26 positions per rotor, all of these permutations can be computed once, at construction time; encoding a letter then costs a single table lookup instead of two modular additions and a wiring lookup.
+
+		The tables are kept as a tuple of 26 bytes objects rather than one flat 676-byte table: in CPython, two sequence indexings (`table[p][c]`) measure about twice as fast as one indexing with a computed offset (`table[p*26+c]`), because the multiply-add goes through boxed integer arithmetic.
+
+		The tables depend only on the wiring, so they are memoized in the module-level `_POSITION_TABLE_CACHE`: rotors sharing a wiring (every machine after the first, in a configuration sweep) share the same immutable tables.
+
+		:return: two lists of 26 tables of 26 codes each, for the outward and backward directions, respectively.
+		:rtype: tuple
+		"""
+		tables = _POSITION_TABLE_CACHE.get( self.out_alphabet_out )
+		if tables is None:
+			out_by_pos = tuple( bytes( (self.out_alphabet_out[ (i+p)%26 ] - p) % 26 for i in range(26) )
+					for p in range(26) )
+			back_by_pos = tuple( bytes( (self.out_alphabet_back[ (i+p)%26 ] - p) % 26 for i in range(26) )
+					for p in range(26) )
+			tables = _POSITION_TABLE_CACHE[ self.out_alphabet_out ] = (out_by_pos, back_by_pos)
+		return tables
+
 
 class Enigma():
 
+	__slots__ = ( 'rotor_LL', 'rotor_L', 'rotor_M', 'rotor_R', 'reflector',
+			'rotors', 'reflectorB', 'plugboard', 'STATIC',
+			'_perm_cache', '_fused_perm_cache', '_plug_trans',
+			'_L_refl_L', '_m_out', '_r_out', '_m_back', '_r_back' )
 
 	def __init__(self, rotor_selection='123', ring_settings='AAA', plugboard=None):
 		""" Create a new Enigma machine.
@@ -161,14 +280,14 @@ class Enigma():
 		# rotor_LL is the 4th rotor - only used in M4 machines
 		self.rotor_LL, self.rotor_L, self.rotor_M, self.rotor_R, self.reflector = (None, None, None, None, None)
 
-		self.rotors = [ Rotor( 'I',  'EKMFLGDQVZNTOWYHXUSPAIBRCJ', 'Q' ), 
-				Rotor( 'II', 'AJDKSIRUXBLHWTMCQGZNPYFVOE', 'E' ),
-				Rotor( 'III','BDFHJLCPRTXVZNYEIWGAKMUSQO', 'V' ),
-				Rotor( 'IV', 'ESOVPZJAYQUIRHXLNFTGKDCMWB', 'J' ),
-				Rotor( 'V',  'VZBRGITYUPSDNHLXAWMJQOFECK', 'Z' )
+		self.rotors = [ Rotor( 'I',  _WIRING_I, 'Q' ),
+				Rotor( 'II', _WIRING_II, 'E' ),
+				Rotor( 'III',_WIRING_III, 'V' ),
+				Rotor( 'IV', _WIRING_IV, 'J' ),
+				Rotor( 'V',  _WIRING_V, 'Z' )
 				]
 		# reflector
-		self.reflectorB = Rotor( 'Wide-B', 'YRUHQSLDPXNGOKMIEBFZCWVJAT' )
+		self.reflectorB = Rotor( 'Wide-B', _WIRING_WIDE_B )
 
 		self._configure( rotor_selection, ring_settings, plugboard )
 
@@ -199,6 +318,22 @@ class Enigma():
 		self.rotor_L.right = self.rotor_M
 		self.rotor_M.right = self.rotor_R
 
+		# pack the assembled tables flat on the machine: the hot paths read
+		# them straight off self instead of walking rotor attribute chains
+		self._fuse_turnaround_tables()
+		self._m_out, self._r_out = self.rotor_M.out_by_pos, self.rotor_R.out_by_pos
+		self._m_back, self._r_back = self.rotor_M.back_by_pos, self.rotor_R.back_by_pos
+
+	def _fuse_turnaround_tables( self ):
+		""" Fuse the turnaround subpath — left rotor out, reflector, left rotor back — into one position-indexed table.
+
+		That subpath depends only on the left rotor's position, so its three stages can be composed into a single 26-byte permutation per position (676 bytes in total), computed once per rotor assembly. The per-letter pipeline then costs 5 lookups instead of 7.
+		"""
+		l_out, l_back = self.rotor_L.out_by_pos, self.rotor_L.back_by_pos
+		reflector = self.reflector.out_by_pos[ self.reflector.position ]
+		self._L_refl_L = tuple( bytes( l_back[ pos ][ reflector[ l_out[ pos ][ code ] ] ] for code in range(26) )
+				for pos in range(26) )
+
 	def get_window( self ):
 		""" Return the 3-letter "window", i.e. the current position for the 3 rotors (with an offset, if the ring setting is 1 or more). 
 
@@ -256,6 +391,12 @@ class Enigma():
 		:type plugboard: tuple
 		:type indicator: str
 		"""
+		# a new rotor selection invalidates any memoized full-state permutation;
+		# the plugboard-fused variants additionally depend on the plugboard,
+		# which is also (re)set here
+		self._perm_cache = {}
+		self._fused_perm_cache = {}
+
 		# choosing the rotors
 		left_rotor = self.rotors[ int(rotor_selection[0])-1 ]
 		middle_rotor = self.rotors[ int(rotor_selection[1])-1 ]
@@ -269,37 +410,70 @@ class Enigma():
 		# configuring the plugboard (steckbrett)
 		self.plugboard = list( range( 0, 26 ))
 		if plugboard is not None and len(plugboard)>0:
-			print(plugboard)
+			if __debug__ and LOGLEVEL >= 2:
+				log('Plugboard: %s', plugboard, level=2)
 			for bigram in plugboard:
 				self.plugboard[ ord(bigram[0])-65 ] = ord(bigram[1])-65
 				self.plugboard[ ord(bigram[1])-65 ] = ord(bigram[0])-65
 
+		# the same substitution, as a 256-byte translation table over ASCII:
+		# whole-message paths apply the plugboard with one C-level translate
+		# call per side; the table is its own inverse, as the plugboard is
+		self._plug_trans = bytes( i if i < 65 or i > 90 else self.plugboard[i-65]+65
+				for i in range(256) )
+
 		# set the start position for the rotors
 		self.set_positions( indicator )	
 
 
+	def _step_keypress( self ):
+		""" Advance the rotor assembly by one keypress: the right rotor always steps, the middle and left rotors step according to the turnover and double-stepping rules.
+
+		This is the once-per-letter path: both notches are read upfront and each position is incremented at most once, in straight-line code with no per-rotor dispatch.
+		"""
+		rotor_r, rotor_m, rotor_l = self.rotor_R, self.rotor_M, self.rotor_L
+		# Ex. if the carry notch for the rotor is 'Q' and the current position is 'Q',
+		# the step that is about to occur also takes the rotor on the left one step further.
+		r_at_notch = (rotor_r.get_window_numeral() == rotor_r.notch)
+		# Double-stepping mechanism: middle rotor in notch position steps even if right-rotor is not in carry mode
+		m_at_notch = (rotor_m.get_window_numeral() == rotor_m.notch)
+		if __debug__ and LOGLEVEL >= 2 and (r_at_notch or m_at_notch):
+			log("TURNOVER: rotor %s at notch: %s, rotor %s at notch: %s", rotor_r.rotor_id, r_at_notch, rotor_m.rotor_id, m_at_notch, level=2)
+		# branchless update: the booleans are 0 or 1, so each position simply
+		# advances by its step count for this tick
+		rotor_r.position = _MOD26[ rotor_r.position + 1 ]
+		rotor_m.position = _MOD26[ rotor_m.position + (r_at_notch or m_at_notch) ]
+		rotor_l.position = _MOD26[ rotor_l.position + m_at_notch ]
+
 	def step( self, rotor ):
-		""" Advance the rotor by one position. If carry notch engages (in the "turnover" position), takes rotor on the left one step further. 
+		""" Advance the rotor by one position. If carry notch engages (in the "turnover" position), takes rotor on the left one step further.
+
+		Stepping from the right rotor — the normal keypress — is resolved with a direct three-rotor update: both notches are read upfront and each position is incremented at most once, with no recursion. Stepping an inner rotor by hand still propagates the carry leftward, one rotor at a time.
 
 		:param rotor: a rotor (i.e. not a reflector)
 		:type rotor: Rotor
 		"""
-		log('step(rotor {}) with notch at {} and window numeral at {} '.format( rotor.rotor_id, rotor.notch, rotor.get_window_numeral() ), 3)
-		# Ex. is carry notch for the rotor is 'Q' and current position is 'Q', the step that is about to occur
-		# will also take the rotor on the left one step further.
-		carry = (rotor.get_window_numeral() == rotor.notch)
-		log('Carry? '+str(carry), 3)
+		if rotor is self.rotor_R:
+			self._step_keypress()
+			return
+
+		# manual stepping of an inner rotor: propagate the carry leftward,
+		# one rotor at a time, without recursing
+		while True:
+			if __debug__ and LOGLEVEL >= 3:
+				log('step(rotor %s) with notch at %d and window numeral at %d ', rotor.rotor_id, rotor.notch, rotor.get_window_numeral(), level=3)
+			carry = (rotor.get_window_numeral() == rotor.notch)
+			if __debug__ and LOGLEVEL >= 3:
+				log('Carry? %s', carry, level=3)
 
-		rotor.increment_position()
+			rotor.increment_position()
 
-		# Double-stepping mechanism: middle rotor in notch position steps even if right-rotor is not in carry mode 
-		if (rotor is self.rotor_R and rotor.left.get_window_numeral() == rotor.left.notch) and not carry:
-			self.step( rotor.left )
+			if rotor.left is None or rotor.left is self.reflector or not carry:
+				break
+			if __debug__ and LOGLEVEL >= 2:
+				log("TURNOVER from rotor %s to rotor %s", rotor.rotor_id, rotor.left.rotor_id, level=2)
+			rotor = rotor.left
 
-		if rotor.left is not None and rotor.left is not self.reflector and carry:
-			log("TURNOVER from rotor {} to rotor {}".format( rotor.rotor_id, rotor.left.rotor_id ),2)
-			self.step( rotor.left )
-				
 
 	def encypher( self, letter ):
 		""" Encode a letter, using the Enigma settings (rotor positions, ring settings) currently defined.
@@ -310,52 +484,209 @@ class Enigma():
 		:rtype: str
 		"""
 
-		log("Encoding {}".format(letter),2)
-		input_code = ord(letter)-65
+		if self.STATIC:
+			# no stepping: the machine is a fixed substitution, served from the
+			# plugboard-fused permutation cache (position and ring changes land
+			# on a different key; plugboard changes clear the cache)
+			perm = self._fused_perm( self.rotor_L.position, self.rotor_M.position, self.rotor_R.position )
+			return _CODE_TO_LETTER[ perm[ _LETTER_TO_CODE[letter] ] ]
+
+		# every instance attribute used on the letter path is bound to a local
+		# once: LOAD_FAST instead of a dictionary lookup per access
+		plugboard = self.plugboard
+		rotor_l, rotor_m, rotor_r = self.rotor_L, self.rotor_M, self.rotor_R
+
+		if __debug__ and LOGLEVEL >= 2:
+			log("Encoding %s", letter, level=2)
+		input_code = _LETTER_TO_CODE[letter]
 
 		# Substitution through the plugboard
-		input_code = self.plugboard[ input_code ]
-		log("Translated by plugboard into {}".format( chr( input_code+65 )), 2)
+		input_code = plugboard[ input_code ]
+		if __debug__ and LOGLEVEL >= 2:
+			log("Translated by plugboard into %s", _CODE_TO_LETTER[ input_code ], level=2)
+
+		if __debug__ and LOGLEVEL >= 2:
+			log('Position before stepping:  %s Window: %s', self.get_internal_positions(), self.get_window(), level=2)
+		self._step_keypress()
+
+		if __debug__ and LOGLEVEL >= 2:
+			log('Position:  %s Window: %s', self.get_internal_positions(), self.get_window(), level=2)
+
+		# 2 rotors out, fused turnaround, 2 rotors back, all in one kernel call
+		input_code = _encypher_code( input_code,
+				rotor_l.position, rotor_m.position, rotor_r.position,
+				self._m_out, self._r_out, self._L_refl_L,
+				self._m_back, self._r_back )
+
+		# plugboard
+		encyphered_letter = _CODE_TO_LETTER[ plugboard[ input_code ] ]
+		if __debug__ and LOGLEVEL >= 2:
+			log('--> encyphered: %s', encyphered_letter, level=2)
+		return encyphered_letter
 
-		log('Position before stepping:  {} Window: {}'.format( self.get_internal_positions(), self.get_window()), 2)	
-		if not self.STATIC:
-			self.step( self.rotor_R )
+	def _full_perm( self, pos_l, pos_m, pos_r ):
+		""" Return the 26-letter permutation realized by the whole rotor assembly (3 rotors out, reflector, 3 rotors back) for the given positions, as a 26-byte table.
 
-		log('Position:  {} Window: {}'.format( self.get_internal_positions(), self.get_window()), 2)	
+		The machine has only 26^3 = 17,576 distinct rotor states for a given rotor selection, so the permutations are memoized: the first request for a state composes the pipeline once (26 letters), every later request is a dictionary lookup. This pays off whenever states recur — fixed-position (STATIC) encoding, and above all cryptanalytic sweeps, where the same ciphertext is decoded over and over against states drawn from the same small pool. The plugboard is deliberately left out of the table: it does not depend on the rotor state, and keeping it out lets a sweep over plugboard candidates reuse the same cache.
 
-		# The way out of the leftmost rotor, to the reflector
-		for rotor in (self.rotor_R, self.rotor_M, self.rotor_L ):
-			
-			if rotor is self.rotor_R:
-				log('Entering rotor {}: {} ({})'.format(rotor.rotor_id, (input_code + rotor.position) %26, chr(input_code + rotor.position +65) ))
-				exit_code = rotor.encode_out( ( input_code + rotor.position) % 26 )
-			else:
-				log('Entering rotor {}: {} ({})'.format(rotor.rotor_id, input_code, chr(input_code + 65) ))
-				exit_code = rotor.encode_out( input_code )
-
-			log('Exiting rotor {}: {} ({})'.format(rotor.rotor_id, exit_code, chr(exit_code+65) ))
-			input_code = (exit_code - rotor.position + rotor.left.position) % 26
-
-		# Turnaround in the reflector
-		log('Entering reflector {}: {} ({})'.format(self.reflector.rotor_id, input_code, chr(input_code + 65) ))
-		exit_code = self.reflector.encode_out( input_code )
-		log('Exiting reflector {}: {} ({})'.format(self.reflector.rotor_id, exit_code, chr(exit_code+65) ))
-		input_code = (exit_code + self.reflector.right.position) % 26
-
-		# The way back to the rightmost rotor
-		for rotor in (self.rotor_L, self.rotor_M, self.rotor_R ):
-			log('Entering rotor {}: {} ({})'.format(rotor.rotor_id, input_code, chr(input_code + 65) ))
-			exit_code = rotor.encode_back( input_code )
-			log('Exiting rotor {}: {} ({})'.format(rotor.rotor_id, exit_code, chr(exit_code+65) ))
-			if rotor is self.rotor_R:
-				input_code = (exit_code - rotor.position) % 26
+		:param pos_l: position of the left rotor.
+		:param pos_m: position of the middle rotor.
+		:param pos_r: position of the right rotor.
+		:type pos_l: int
+		:type pos_m: int
+		:type pos_r: int
+		:return: a 26-byte permutation table, mapping plugboard-substituted input codes to output codes.
+		:rtype: bytes
+		"""
+		key = (pos_l, pos_m, pos_r)
+		perm = self._perm_cache.get( key )
+		if perm is None:
+			m_out, r_out = self._m_out, self._r_out
+			m_back, r_back = self._m_back, self._r_back
+			l_refl_l = self._L_refl_L
+			perm = bytes( _encypher_code( code, pos_l, pos_m, pos_r,
+					m_out, r_out, l_refl_l, m_back, r_back )
+					for code in range(26) )
+			self._perm_cache[ key ] = perm
+		return perm
+
+	def _fused_perm( self, pos_l, pos_m, pos_r ):
+		""" Return the end-to-end permutation for the given rotor positions, plugboard included at both ends, as a 26-byte table.
+
+		Memoized like :meth:`_full_perm`, from which it is derived; kept in a separate cache because it also depends on the plugboard, and is therefore invalidated whenever the machine is reconfigured. With this table, encoding a letter under a fixed state is a single byte lookup.
+
+		:param pos_l: position of the left rotor.
+		:param pos_m: position of the middle rotor.
+		:param pos_r: position of the right rotor.
+		:type pos_l: int
+		:type pos_m: int
+		:type pos_r: int
+		:return: a 26-byte permutation table, mapping plaintext codes to ciphertext codes.
+		:rtype: bytes
+		"""
+		key = (pos_l, pos_m, pos_r)
+		perm = self._fused_perm_cache.get( key )
+		if perm is None:
+			plugboard = self.plugboard
+			rotor_perm = self._full_perm( pos_l, pos_m, pos_r )
+			perm = bytes( plugboard[ rotor_perm[ plugboard[ code ] ] ] for code in range(26) )
+			self._fused_perm_cache[ key ] = perm
+		return perm
+
+	def build_translation_table( self ):
+		""" Build a translation table for the machine in its current state, suitable for `bytes.translate`.
+
+		With stepping disabled (STATIC mode) the machine is a single fixed substitution alphabet; a whole message can then be encoded with one C-level `translate` call instead of a Python loop. The table includes the plugboard at both ends.
+
+		:return: a 256-byte translation table mapping the ASCII uppercase letters to their encyphered counterparts.
+		:rtype: bytes
+		"""
+		perm = self._fused_perm( self.rotor_L.position, self.rotor_M.position, self.rotor_R.position )
+		return bytes.maketrans( bytes( range(65, 91) ),
+				bytes( code + 65 for code in perm ))
+
+	def _stepping_schedule( self, length ):
+		""" Precompute the sequence of rotor positions for the next `length` letters.
+
+		Stepping is deterministic: given the current positions, the positions traversed by an entire message can be simulated upfront with 3 integers, without doing any encyphering work. If the machine is STATIC, the current positions simply repeat.
+
+		:param length: the number of letters about to be encyphered.
+		:type length: int
+		:return: three lists of `length` positions, for the L, M, and R rotors, respectively; entry i holds the positions in effect when letter i is encyphered (i.e. after the stepping that precedes it).
+		:rtype: tuple
+		"""
+		pos_l, pos_m, pos_r = self.rotor_L.position, self.rotor_M.position, self.rotor_R.position
+		if self.STATIC:
+			return ( [pos_l]*length, [pos_m]*length, [pos_r]*length )
+
+		ring_m, ring_r = self.rotor_M.ring_setting, self.rotor_R.ring_setting
+		notch_m, notch_r = self.rotor_M.notch, self.rotor_R.notch
+		schedule_l, schedule_m, schedule_r = [], [], []
+		for i in range(length):
+			r_at_notch = _MOD26[ pos_r + ring_r ] == notch_r
+			# double-stepping: the M rotor in notch position steps on its own
+			m_at_notch = _MOD26[ pos_m + ring_m ] == notch_m
+			pos_r = _MOD26[ pos_r + 1 ]
+			pos_m = _MOD26[ pos_m + (r_at_notch or m_at_notch) ]
+			pos_l = _MOD26[ pos_l + m_at_notch ]
+			schedule_l.append( pos_l )
+			schedule_m.append( pos_m )
+			schedule_r.append( pos_r )
+		return (schedule_l, schedule_m, schedule_r)
+
+	def encypher_bulk(self, string ):
+		""" Encode a whole (already cleaned-up) string at once, from the current rotor positions.
+
+		Functionally identical to calling :meth:`encypher` on every letter, but the per-letter work is reduced to a handful of table lookups: the stepping schedule is precomputed with :meth:`_stepping_schedule`, and the rotor tables are bound to local variables outside the loop.
+
+		:param string: the message to be encoded, as an uppercase-letters-only string.
+		:type string: str
+		:return: the encoded message
+		:rtype: str
+		"""
+		if self.STATIC:
+			# fixed rotor state: one C-level translate call does the whole string
+			return string.encode().translate( self.build_translation_table() ).decode()
+
+		length = len( string )
+		schedule_l, schedule_m, schedule_r = self._stepping_schedule( length )
+
+		r_out, m_out = self._r_out, self._m_out
+		r_back, m_back = self._r_back, self._m_back
+		l_refl_l = self._L_refl_L
+
+		# both plugboard passes are hoisted out of the loop: one C-level
+		# translate call over the whole message on each side of the rotors
+		data = string.encode().translate( self._plug_trans )
+
+		encyphered = bytearray( length )
+		# the kernel is inlined here: at N letters per call, the per-letter
+		# function call overhead is worth trading against the duplication
+		for i, byte in enumerate( data ):
+			pos_r, pos_m = schedule_r[i], schedule_m[i]
+			code = byte - 65
+			code = r_out[ pos_r ][ code ]
+			code = m_out[ pos_m ][ code ]
+			code = l_refl_l[ schedule_l[i] ][ code ]
+			code = m_back[ pos_m ][ code ]
+			code = r_back[ pos_r ][ code ]
+			encyphered[i] = code + 65
+
+		# leave the machine in the same state as the letter-by-letter path
+		if length > 0:
+			self.rotor_L.position, self.rotor_M.position, self.rotor_R.position = schedule_l[-1], schedule_m[-1], schedule_r[-1]
+		return bytes( encyphered ).translate( self._plug_trans ).decode()
+
+	def decrypt_batch( self, ciphertext, configurations ):
+		""" Decode a ciphertext under a batch of candidate configurations (cryptanalysis helper).
+
+		The classical companion workload to this emulator is an exhaustive search over rotor orderings, ring settings and indicators. This method runs such a sweep efficiently on one machine: candidates sharing a rotor selection skip the reassembly work, and every letter is decoded through the memoized full-state permutations of :meth:`_full_perm` — across many candidate indicators the states are drawn from the same pool of at most 26^3, so the tables are composed once and reused throughout the sweep. The plugboard is reset to the identity; plugboard candidates are best swept outside, around this call.
+
+		:param ciphertext: the message to be decoded, as an uppercase-letters-only string.
+		:param configurations: an iterable of (rotor_selection, ring_settings, indicator) triples, with the same conventions as :meth:`_configure`.
+		:type ciphertext: str
+		:type configurations: iterable
+		:return: the decoded strings, one per configuration, in input order.
+		:rtype: list
+		"""
+		codes = [ _LETTER_TO_CODE[letter] for letter in ciphertext ]
+		length = len( codes )
+		full_perm = self._full_perm
+		results = []
+		current_selection = None
+		for rotor_selection, ring_settings, indicator in configurations:
+			if rotor_selection != current_selection:
+				# a new rotor selection invalidates the permutation cache
+				self._configure( rotor_selection, ring_settings, indicator=indicator )
+				current_selection = rotor_selection
 			else:
-				input_code = (exit_code - rotor.position + rotor.right.position) % 26
-		
-		# plugboard 
-		encyphered_letter = chr( self.plugboard[ input_code ] + 65 )
-		log('--> encyphered: ' + encyphered_letter, 2 )
-		return encyphered_letter
+				self.set_rings( ring_settings )
+				self.set_positions( indicator )
+			schedule_l, schedule_m, schedule_r = self._stepping_schedule( length )
+			results.append( ''.join(
+					_CODE_TO_LETTER[ full_perm( schedule_l[i], schedule_m[i], schedule_r[i] )[ codes[i] ] ]
+					for i in range(length) ))
+		return results
 
 	def encypher_string(self, string, indicator='AAA'):
 		""" Encode a string of characters, given an (optional) indicator.
@@ -368,9 +699,8 @@ class Enigma():
 		:rtype: str
 		"""
 		self.set_positions( indicator )
-		cleaned_up_string =  string.translate(str.maketrans('','',' .,;:?!@%+-_\'')).upper()
-		encyphered_string = [ self.encypher(letter) for letter in cleaned_up_string ]
-		return ''.join( encyphered_string )
+		cleaned_up_string =  string.translate( _CLEAN_TRANS ).upper()
+		return self.encypher_bulk( cleaned_up_string )
 
 	def configure(self):
 		""" Interactive interface for the _configure method: set the daily parameters for the machine (not the starting position, which is 'AAA' by default and needs to be set for every message).
@@ -407,15 +737,82 @@ class Enigma():
 			self.set_positions( start_position )
 
 			message = input("Enter the message: " )
-			cleaned_up_message =  message.translate(str.maketrans('','',' .,;:?!@%+-_\'')).upper()
-			encoded_message = []
-			for letter in list( cleaned_up_message ):
-				encoded_message.append( self.encypher( letter ))
+			cleaned_up_message =  message.translate( _CLEAN_TRANS ).upper()
 			print( cleaned_up_message )
-			print(''.join( encoded_message ) )
+			if self.STATIC:
+				# fixed rotor state: the whole message is a single substitution
+				print( cleaned_up_message.encode().translate( self.build_translation_table() ).decode())
+			else:
+				print( self.encypher_bulk( cleaned_up_message ))
 
 	
 
+def index_of_coincidence( text ):
+	""" Compute the index of coincidence of a text: the probability that two letters drawn at random from it are equal.
+
+	German plain text scores around 0.076, while text decoded under a wrong key looks uniformly random and scores around 1/26 (0.0385) -- which makes the index a cheap fitness function for key searches.
+
+	:param text: an uppercase-letters-only string.
+	:type text: str
+	:return: the index of coincidence, between 0 and 1.
+	:rtype: float
+	"""
+	length = len( text )
+	if length < 2:
+		return 0.0
+	counts = [0]*26
+	for letter in text:
+		counts[ _LETTER_TO_CODE[letter] ] += 1
+	return sum( count*(count-1) for count in counts ) / (length*(length-1))
+
+
+def _crack_shard( args ):
+	""" Score every indicator of one rotor selection against a ciphertext (one worker's share of :func:`crack`).
+
+	A module-level function, so that :mod:`multiprocessing` can pickle it; each worker owns its Enigma machine and sweeps the full 26^3 indicator space through :meth:`Enigma.decrypt_batch`.
+
+	:param args: a (ciphertext, rotor_selection, ring_settings, fitness_fn) tuple, with ring_settings an iterable of 3-letter ring candidates.
+	:type args: tuple
+	:return: the best (score, (rotor_selection, ring_settings, indicator)) pair of the shard.
+	:rtype: tuple
+	"""
+	ciphertext, rotor_selection, ring_settings, fitness_fn = args
+	configurations = [ (rotor_selection, rings,
+			_CODE_TO_LETTER[l] + _CODE_TO_LETTER[m] + _CODE_TO_LETTER[r])
+			for rings in ring_settings
+			for l in range(26) for m in range(26) for r in range(26) ]
+	enigma = Enigma( rotor_selection )
+	plaintexts = enigma.decrypt_batch( ciphertext, configurations )
+	return max( zip( map( fitness_fn, plaintexts ), configurations ))
+
+
+def crack( ciphertext, fitness_fn=index_of_coincidence, rotor_selections=None, ring_settings=('AAA',), processes=None ):
+	""" Search for the configuration that decodes a ciphertext, in parallel.
+
+	The candidate space is embarrassingly parallel: each rotor selection is an independent shard, handed to a pool of worker processes that each run their own machine. Within a shard all 26^3 indicators are tried for each ring candidate, and the decodes are ranked with the fitness function.
+
+	:param ciphertext: the message to be decoded, as an uppercase-letters-only string.
+	:param fitness_fn: a picklable function scoring a candidate plain text (higher is better); defaults to :func:`index_of_coincidence`.
+	:param rotor_selections: the rotor orderings to try, as 3-digit strings; defaults to all 60 orderings of the 5 rotors.
+	:param ring_settings: the ring candidates to try for each ordering, as 3-letter strings.
+	:param processes: the number of worker processes; defaults to the CPU count.
+	:type ciphertext: str
+	:type rotor_selections: iterable
+	:type ring_settings: iterable
+	:type processes: int
+	:return: the best (score, (rotor_selection, ring_settings, indicator)) pair over the whole search.
+	:rtype: tuple
+	"""
+	if rotor_selections is None:
+		rotor_selections = [ '{}{}{}'.format( l, m, r )
+				for l in range(1,6) for m in range(1,6) for r in range(1,6)
+				if l != m and l != r and m != r ]
+	ring_settings = tuple( ring_settings )
+	shards = [ (ciphertext, selection, ring_settings, fitness_fn) for selection in rotor_selections ]
+	with Pool( processes ) as pool:
+		return max( pool.map( _crack_shard, shards ))
+
+
 class TestRotors( unittest.TestCase ):
 
 	def setUp(self):
@@ -547,6 +944,80 @@ class TestRotors( unittest.TestCase ):
 		self.enigma = Enigma('425', 'GMY', plugboard = ('DN', 'GR', 'IS', 'KC', 'QX', 'TM', 'PV', 'HY', 'FW', 'BJ'))
 		self.assertEqual( self.enigma.encypher_string('NQVLT YQFSE WWGJZ GQHVS EIXIM YKCNW IEBMB ATPPZ TDVCU PKAY', 'RLP'), 'FLUGZEUGFUEHRERISTOFWYYXFUELLGRAFXFUELLGPAFXPOFOP')
 
+	def test_encypher_bulk( self ):
+		""" Bulk encoding matches the letter-by-letter path """
+		self.enigma = Enigma('425', 'GMY', plugboard = ('DN', 'GR', 'IS', 'KC', 'QX', 'TM', 'PV', 'HY', 'FW', 'BJ'))
+		self.enigma.set_positions('RLP')
+		self.assertEqual( self.enigma.encypher_bulk('NQVLTYQFSEWWGJZGQHVSEIXIMYKCNWIEBMBATPPZTDVCUPKAY'), 'FLUGZEUGFUEHRERISTOFWYYXFUELLGRAFXFUELLGPAFXPOFOP')
+
+	def test_encypher_bulk_leaves_same_positions( self ):
+		""" Bulk encoding leaves the rotors where letter-by-letter encoding would """
+		self.enigma.set_positions('ADS')
+		self.enigma.encypher_bulk('A'*100)
+		reference = Enigma()
+		reference.set_positions('ADS')
+		for i in range(100):
+			reference.encypher('A')
+		self.assertEqual( self.enigma.get_window(), reference.get_window() )
+
+	def test_full_perm( self ):
+		""" The memoized full-state permutation matches letter-by-letter encoding """
+		self.enigma.STATIC = True
+		self.enigma.set_positions('KCB')
+		perm = self.enigma._full_perm( self.enigma.rotor_L.position, self.enigma.rotor_M.position, self.enigma.rotor_R.position )
+		for code in range(26):
+			self.assertEqual( chr( perm[code] + 65 ), self.enigma.encypher( chr( code+65 )))
+
+	def test_build_translation_table( self ):
+		""" The static translation table matches letter-by-letter encoding, plugboard included """
+		self.enigma = Enigma('123', 'AAA', plugboard=('AN', 'PF'))
+		self.enigma.STATIC = True
+		table = self.enigma.build_translation_table()
+		translated = 'ANPF'.encode().translate( table ).decode()
+		self.assertEqual( translated, ''.join( self.enigma.encypher( letter ) for letter in 'ANPF' ))
+
+	def test_decrypt_batch( self ):
+		""" Batch decoding matches encypher_string for every candidate configuration """
+		ciphertext = 'NVY'
+		configurations = [ ('123', 'GMY', 'DHO'), ('523', 'GMY', 'DHO'), ('523', 'AAA', 'AAA') ]
+		results = self.enigma.decrypt_batch( ciphertext, configurations )
+		for (rotor_selection, ring_settings, indicator), decoded in zip( configurations, results ):
+			reference = Enigma( rotor_selection, ring_settings )
+			self.assertEqual( decoded, reference.encypher_string( ciphertext, indicator ))
+
+	def test_index_of_coincidence( self ):
+		""" Known values: degenerate inputs, a one-letter text and a uniform text """
+		self.assertEqual( index_of_coincidence( '' ), 0.0 )
+		self.assertEqual( index_of_coincidence( 'A' ), 0.0 )
+		self.assertEqual( index_of_coincidence( 'AAAA' ), 1.0 )
+		self.assertAlmostEqual( index_of_coincidence( 'ABCDEFGHIJKLMNOPQRSTUVWXYZ' ), 0.0 )
+
+	def test_crack( self ):
+		""" The parallel search recovers the key of a short weather report, from a restricted candidate set """
+		plain = 'WETTERBERICHTFUERDENNORDATLANTIKSTURMTIEFUEBERISLANDZIEHTOSTWAERTS'
+		ciphertext = Enigma( '213' ).encypher_string( plain, 'QEV' )
+		score, (rotor_selection, ring_settings, indicator) = crack( ciphertext,
+				rotor_selections=( '123', '213' ), processes=2 )
+		self.assertEqual( (rotor_selection, ring_settings, indicator), ('213', 'AAA', 'QEV') )
+		self.assertAlmostEqual( score, index_of_coincidence( plain ))
+
+	def test_back_alphabet_is_inverse_permutation( self ):
+		""" The back alphabet inverts the wiring, for every rotor and the reflector """
+		for rotor in self.enigma.rotors + [ self.enigma.reflectorB ]:
+			for code in range(26):
+				self.assertEqual( rotor.out_alphabet_back[ rotor.out_alphabet_out[ code ] ], code )
+
+	def test_stepping_schedule_matches_scalar_stepping( self ):
+		""" The precomputed schedule tracks step() over thousands of letters, double-stepping included """
+		self.enigma._configure('123', 'BCD', indicator='ADT')
+		schedule_l, schedule_m, schedule_r = self.enigma._stepping_schedule( 2000 )
+		reference = Enigma('123', 'BCD')
+		reference.set_positions('ADT')
+		for i in range(2000):
+			reference.step( reference.rotor_R )
+			self.assertEqual( (schedule_l[i], schedule_m[i], schedule_r[i]),
+					(reference.rotor_L.position, reference.rotor_M.position, reference.rotor_R.position) )
+
 	def test_ring_setting( self ):
 		print("\nTest polyalphabetic sequential encoding, with R-rotor only and ring setting 'BBB'")
 